@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from functools import partial
+from types import MappingProxyType
 
 import mistralai
 
@@ -17,31 +19,58 @@ from homeassistant.helpers import (
 )
 from homeassistant.helpers.typing import ConfigType
 
+from .batch import BatchJobTracker, async_remove_batch_jobs
 from .const import (
+    CONF_API_KEYS,
     CONF_CHAT_MODEL,
+    DEFAULT_AI_TASK_NAME,
     DEFAULT_CONVERSATION_NAME,
     DOMAIN,
     LOGGER,
+    RECOMMENDED_AI_TASK_OPTIONS,
     RECOMMENDED_CHAT_MODEL,
 )
+from .key_pool import ApiKeyPool
+from .memory import async_remove_stale_memories
+from .services import async_setup_services
+from .stats import MistralStats
+from .tool_cache import ToolResultCache
 
-PLATFORMS = (Platform.CONVERSATION,)
+PLATFORMS = (Platform.AI_TASK, Platform.CONVERSATION)
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
-type MistralConfigEntry = ConfigEntry[mistralai.Mistral]
+
+@dataclass
+class MistralRuntimeData:
+    """Runtime data for a Mistral config entry."""
+
+    key_pool: ApiKeyPool
+    tool_cache: ToolResultCache
+    batch_jobs: BatchJobTracker
+    stats: MistralStats = field(default_factory=MistralStats)
+
+
+type MistralConfigEntry = ConfigEntry[MistralRuntimeData]
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up Mistral"""
     await async_migrate_integration(hass)
+    async_setup_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: MistralConfigEntry) -> bool:
     """Set up Mistral from a config entry."""
-    client = await hass.async_add_executor_job(
-        partial(mistralai.Mistral, api_key=entry.data[CONF_API_KEY])
+    api_keys = dict.fromkeys(
+        (entry.data[CONF_API_KEY], *entry.data.get(CONF_API_KEYS, []))
     )
+    clients = [
+        await hass.async_add_executor_job(partial(mistralai.Mistral, api_key=api_key))
+        for api_key in api_keys
+    ]
+    key_pool = ApiKeyPool(clients)
+    client = key_pool.primary.client
     try:
         # Use model from first conversation subentry for validation
         subentries = list(entry.subentries.values())
@@ -59,7 +88,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: MistralConfigEntry) -> b
         else:
             LOGGER.error("An error occurred while setting up the integration: %s", err)
 
-    entry.runtime_data = client
+    # Subentries removed since the last setup leave their memory behind
+    await async_remove_stale_memories(
+        hass,
+        (
+            subentry_id
+            for config_entry in hass.config_entries.async_entries(DOMAIN)
+            for subentry_id in config_entry.subentries
+        ),
+    )
+
+    tool_cache = ToolResultCache(hass)
+    entry.async_on_unload(tool_cache.async_setup())
+
+    # Batch jobs have their own rate budget, keep them off the balanced keys
+    batch_jobs = BatchJobTracker(hass, entry, client)
+
+    entry.runtime_data = MistralRuntimeData(
+        key_pool=key_pool, tool_cache=tool_cache, batch_jobs=batch_jobs
+    )
+    await batch_jobs.async_setup()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -73,6 +121,20 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove Mistral data of a deleted config entry."""
+    await async_remove_batch_jobs(hass, entry.entry_id)
+    await async_remove_stale_memories(
+        hass,
+        (
+            subentry_id
+            for config_entry in hass.config_entries.async_entries(DOMAIN)
+            if config_entry.entry_id != entry.entry_id
+            for subentry_id in config_entry.subentries
+        ),
+    )
+
+
 async def async_update_options(
     hass: HomeAssistant, entry: MistralConfigEntry
 ) -> None:
@@ -175,6 +237,23 @@ async def async_migrate_entry(hass: HomeAssistant, entry: MistralConfigEntry) ->
 
         hass.config_entries.async_update_entry(entry, minor_version=2)
 
+    if entry.version == 2 and entry.minor_version == 2:
+        # Entries created before the AI task platform get its default subentry
+        if not any(
+            subentry.subentry_type == "ai_task_data"
+            for subentry in entry.subentries.values()
+        ):
+            hass.config_entries.async_add_subentry(
+                entry,
+                ConfigSubentry(
+                    data=MappingProxyType(RECOMMENDED_AI_TASK_OPTIONS),
+                    subentry_type="ai_task_data",
+                    title=DEFAULT_AI_TASK_NAME,
+                    unique_id=None,
+                ),
+            )
+        hass.config_entries.async_update_entry(entry, minor_version=3)
+
     LOGGER.debug(
         "Migration to version %s:%s successful", entry.version, entry.minor_version
     )
@@ -0,0 +1,119 @@
+"""AI Task integration for Mistral."""
+
+from __future__ import annotations
+
+from json import JSONDecodeError
+
+from voluptuous_openapi import convert
+
+from homeassistant.components import ai_task, conversation
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import llm
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+from homeassistant.util import slugify
+from homeassistant.util.json import json_loads
+
+from . import MistralConfigEntry
+from .const import EVENT_AI_TASK_FIELD, LOGGER
+from .entity import MistralBaseLLMEntity
+from .json_stream import IncrementalJSONObjectParser
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: MistralConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Set up AI Task entities."""
+    for subentry in config_entry.subentries.values():
+        if subentry.subentry_type != "ai_task_data":
+            continue
+
+        async_add_entities(
+            [MistralTaskEntity(config_entry, subentry)],
+            config_subentry_id=subentry.subentry_id,
+        )
+
+
+class MistralTaskEntity(
+    ai_task.AITaskEntity,
+    MistralBaseLLMEntity,
+):
+    """Mistral AI Task entity."""
+
+    _attr_supported_features = ai_task.AITaskEntityFeature.GENERATE_DATA
+
+    async def _async_generate_data(
+        self,
+        task: ai_task.GenDataTask,
+        chat_log: conversation.ChatLog,
+    ) -> ai_task.GenDataTaskResult:
+        """Handle a generate data task.
+
+        With a structure, fields of the JSON output are fired as events as
+        soon as they are complete, before the whole output is generated.
+        """
+        if not task.structure:
+            await self._async_handle_chat_log(chat_log)
+            return ai_task.GenDataTaskResult(
+                conversation_id=chat_log.conversation_id,
+                data=self._get_response_text(chat_log),
+            )
+
+        response_format = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": slugify(task.name) or "task",
+                "schema": convert(
+                    task.structure, custom_serializer=llm.selector_serializer
+                ),
+                "strict": True,
+            },
+        }
+        parser = IncrementalJSONObjectParser()
+
+        @callback
+        def _content_callback(content: str) -> None:
+            """Fire the fields completed by the streamed content."""
+            try:
+                fields = parser.feed_text(content)
+            except JSONDecodeError as err:
+                LOGGER.debug("Unable to parse streamed field: %s", err)
+                return
+            for field, value in fields:
+                self.hass.bus.async_fire(
+                    EVENT_AI_TASK_FIELD,
+                    {
+                        "entity_id": self.entity_id,
+                        "task_name": task.name,
+                        "field": field,
+                        "value": value,
+                    },
+                )
+
+        await self._async_handle_chat_log(
+            chat_log, response_format, _content_callback
+        )
+
+        text = self._get_response_text(chat_log)
+        try:
+            data = json_loads(text)
+        except JSONDecodeError as err:
+            LOGGER.error(
+                "Failed to parse JSON response: %s. Response: %s", err, text
+            )
+            raise HomeAssistantError("Error with Mistral structured response") from err
+
+        return ai_task.GenDataTaskResult(
+            conversation_id=chat_log.conversation_id,
+            data=data,
+        )
+
+    def _get_response_text(self, chat_log: conversation.ChatLog) -> str:
+        """Return the content of the final assistant message."""
+        if not chat_log.messages or chat_log.messages[-1].role != "assistant":
+            raise HomeAssistantError(
+                "Last message in chat log is not an assistant message"
+            )
+        return chat_log.messages[-1].content or ""
@@ -0,0 +1,329 @@
+"""Streaming LLM backends for the Mistral integration.
+
+Backends turn a Mistral-style chat request into a stream of StreamDelta, so
+the entities handle content, tool calls and usage the same way whichever
+engine generates the response.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from functools import partial
+import json
+import re
+import secrets
+import string
+import time
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+import httpx
+import mistralai
+from mistralai.models import CompletionEvent
+from mistralai.utils.eventstreaming import EventStreamAsync
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import BACKEND_FAILURE_COOLDOWN, BACKEND_LATENCY_SMOOTHING
+from .key_pool import PooledKey
+from .stream import StreamStalledError, StreamTimeouts, async_watch_stream
+
+if TYPE_CHECKING:
+    from . import MistralConfigEntry
+
+# Request parameters only understood by the Mistral API
+MISTRAL_ONLY_PARAMS = ("thinking_budget",)
+
+_MISTRAL_TOOL_CALL_ID_RE = re.compile("[a-zA-Z0-9]{9}")
+_TOOL_CALL_ID_ALPHABET = string.ascii_letters + string.digits
+
+
+class BackendError(HomeAssistantError):
+    """Error raised when a backend fails to answer."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        """Initialize the error with the HTTP status of the reply, if any."""
+        super().__init__(message)
+        self.status = status
+
+
+def is_failover_error(err: Exception) -> bool:
+    """Return whether another backend may succeed where this one failed.
+
+    Transport errors, stalls, rate limits and server errors are worth a retry
+    elsewhere; any other status means the request itself was rejected.
+    """
+    if isinstance(err, StreamStalledError | httpx.TransportError):
+        return True
+    if isinstance(err, mistralai.models.SDKError):
+        status: int | None = err.status_code
+    elif isinstance(err, BackendError):
+        status = err.status
+    else:
+        return False
+    return status is None or status == 429 or status >= 500
+
+
+@dataclass(slots=True)
+class StreamDelta:
+    """Chunk of a streamed response."""
+
+    content: str | None = None
+    tool_calls: list[dict[str, Any]] = field(default_factory=list)
+    usage: dict[str, int] | None = None
+
+    @property
+    def has_token(self) -> bool:
+        """Return if the chunk carries generated content or tool calls."""
+        return bool(self.content or self.tool_calls)
+
+
+class LLMBackend(ABC):
+    """Engine generating streamed chat responses."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize the backend."""
+        self.name = name
+        # Moving average of the time to the first delta, in seconds
+        self.latency: float | None = None
+        self._unhealthy_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        """Return if the backend can take requests."""
+        return time.monotonic() >= self._unhealthy_until
+
+    def report_latency(self, latency: float) -> None:
+        """Record the time to the first delta of a request."""
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += BACKEND_LATENCY_SMOOTHING * (latency - self.latency)
+
+    def report_failure(self) -> None:
+        """Skip the backend for a while after a failed request."""
+        self._unhealthy_until = time.monotonic() + BACKEND_FAILURE_COOLDOWN
+
+    @abstractmethod
+    def async_stream(
+        self, request_params: dict[str, Any], timeouts: StreamTimeouts
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream the response to a Mistral-style chat request."""
+
+
+def _tool_call(
+    call_id: str | None, name: str, arguments: str | dict[str, Any]
+) -> dict[str, Any]:
+    """Return a tool call in the format stored in the chat log.
+
+    The chat log is replayed to Mistral, which only accepts ids of nine
+    alphanumeric characters, so other ids are replaced.
+    """
+    if not call_id or not _MISTRAL_TOOL_CALL_ID_RE.fullmatch(call_id):
+        call_id = "".join(secrets.choice(_TOOL_CALL_ID_ALPHABET) for _ in range(9))
+    return {
+        "id": call_id,
+        "function": {"name": name, "arguments": arguments},
+        "type": "function",
+    }
+
+
+def _chunk_has_token(chunk: CompletionEvent) -> bool:
+    """Return if a stream chunk carries generated content or tool calls."""
+    if not chunk.data or not chunk.data.choices:
+        return False
+    delta = chunk.data.choices[0].delta
+    return bool(delta.content or delta.tool_calls)
+
+
+class MistralBackend(LLMBackend):
+    """Backend using the Mistral SDK and the API key pool of the entry."""
+
+    def __init__(self, entry: MistralConfigEntry) -> None:
+        """Initialize the backend."""
+        super().__init__("mistral")
+        self.entry = entry
+
+    async def async_stream(
+        self, request_params: dict[str, Any], timeouts: StreamTimeouts
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream the response with the API key pool of the entry.
+
+        The key is held until the stream is consumed, so tool calls and the
+        following rounds do not count as outstanding requests.
+        """
+        key_pool = self.entry.runtime_data.key_pool
+
+        async def _async_open_stream(
+            key: PooledKey,
+        ) -> EventStreamAsync[CompletionEvent]:
+            """Open the stream with the given key."""
+            stream = await key.client.chat.stream_async(**request_params)
+            key_pool.report_response(key, stream.response.headers)
+            return stream
+
+        async def _async_stream_key(key: PooledKey) -> AsyncIterator[StreamDelta]:
+            """Stream the response with the given key."""
+            async for chunk in async_watch_stream(
+                partial(_async_open_stream, key), timeouts, _chunk_has_token
+            ):
+                yield self._convert_chunk(chunk)
+
+        async for delta in key_pool.async_stream(_async_stream_key):
+            yield delta
+
+    @staticmethod
+    def _convert_chunk(chunk: CompletionEvent) -> StreamDelta:
+        """Convert a Mistral stream chunk."""
+        result = StreamDelta()
+        if chunk.data.usage:
+            result.usage = {
+                "prompt_tokens": chunk.data.usage.prompt_tokens or 0,
+                "completion_tokens": chunk.data.usage.completion_tokens or 0,
+            }
+        if not chunk.data.choices:
+            return result
+
+        delta = chunk.data.choices[0].delta
+        if isinstance(delta.content, str):
+            result.content = delta.content
+        for tool_call in delta.tool_calls or []:
+            if tool_call.function:
+                result.tool_calls.append(
+                    _tool_call(
+                        tool_call.id,
+                        tool_call.function.name,
+                        tool_call.function.arguments,
+                    )
+                )
+        return result
+
+
+class _ServerSentEvents:
+    """Async context manager iterating the JSON events of an SSE response."""
+
+    def __init__(self, response: aiohttp.ClientResponse) -> None:
+        """Initialize the stream."""
+        self._response = response
+
+    async def __aenter__(self) -> AsyncIterator[dict[str, Any]]:
+        """Return the event iterator."""
+        return self._async_events()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the response."""
+        self._response.close()
+
+    async def _async_events(self) -> AsyncIterator[dict[str, Any]]:
+        """Yield the decoded data of each event."""
+        async for raw_line in self._response.content:
+            line = raw_line.decode().strip()
+            if not line.startswith("data:"):
+                continue
+            data = line.removeprefix("data:").strip()
+            if data == "[DONE]":
+                return
+            yield json.loads(data)
+
+
+def _event_has_token(event: dict[str, Any]) -> bool:
+    """Return if an OpenAI stream event carries content or tool calls."""
+    if not (choices := event.get("choices")):
+        return False
+    delta = choices[0].get("delta") or {}
+    return bool(delta.get("content") or delta.get("tool_calls"))
+
+
+class OpenAICompatibleBackend(LLMBackend):
+    """Backend for an OpenAI-compatible chat completions endpoint.
+
+    For example a llama.cpp server on the local network.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, base_url: str, model: str, api_key: str = ""
+    ) -> None:
+        """Initialize the backend."""
+        super().__init__("openai_compatible")
+        self.hass = hass
+        self.url = f"{base_url.rstrip('/')}/chat/completions"
+        self.model = model
+        self.api_key = api_key
+
+    async def async_stream(
+        self, request_params: dict[str, Any], timeouts: StreamTimeouts
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream the response from the endpoint."""
+        payload = {
+            key: value
+            for key, value in request_params.items()
+            if key not in MISTRAL_ONLY_PARAMS
+        }
+        payload.update(
+            model=self.model or request_params["model"],
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        session = async_get_clientsession(self.hass)
+
+        async def _async_open_stream() -> _ServerSentEvents:
+            """Open the stream."""
+            try:
+                response = await session.post(self.url, json=payload, headers=headers)
+            except aiohttp.ClientError as err:
+                raise BackendError(f"Error connecting to {self.url}: {err}") from err
+            if response.status >= 400:
+                message = await response.text()
+                response.close()
+                raise BackendError(
+                    f"{self.url} returned status {response.status}: {message}",
+                    response.status,
+                )
+            return _ServerSentEvents(response)
+
+        # Tool calls are streamed in fragments, keyed by their index
+        pending_calls: dict[int, dict[str, Any]] = {}
+        try:
+            async for event in async_watch_stream(
+                _async_open_stream, timeouts, _event_has_token
+            ):
+                result = StreamDelta()
+                if usage := event.get("usage"):
+                    result.usage = {
+                        "prompt_tokens": usage.get("prompt_tokens", 0),
+                        "completion_tokens": usage.get("completion_tokens", 0),
+                    }
+                if choices := event.get("choices"):
+                    delta = choices[0].get("delta") or {}
+                    result.content = delta.get("content")
+                    for fragment in delta.get("tool_calls") or []:
+                        call = pending_calls.setdefault(
+                            fragment.get("index", len(pending_calls)),
+                            {"id": None, "name": "", "arguments": ""},
+                        )
+                        function = fragment.get("function") or {}
+                        call["id"] = call["id"] or fragment.get("id")
+                        call["name"] += function.get("name") or ""
+                        call["arguments"] += function.get("arguments") or ""
+                yield result
+        except aiohttp.ClientError as err:
+            raise BackendError(f"Error reading from {self.url}: {err}") from err
+
+        if pending_calls:
+            yield StreamDelta(
+                tool_calls=[
+                    _tool_call(call["id"], call["name"], call["arguments"])
+                    for _, call in sorted(pending_calls.items())
+                ]
+            )
@@ -0,0 +1,232 @@
+"""Batch jobs for bulk, non-interactive generation with Mistral."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import mistralai
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    BATCH_FINAL_STATUSES,
+    BATCH_MAX_POLL_FAILURES,
+    BATCH_POLL_INTERVAL,
+    BATCH_STORAGE_VERSION,
+    DOMAIN,
+    EVENT_BATCH_COMPLETED,
+    LOGGER,
+)
+
+if TYPE_CHECKING:
+    from . import MistralConfigEntry
+
+
+def _build_input_file(
+    prompts: list[dict[str, str]],
+    instructions: str | None,
+    max_tokens: int | None,
+) -> bytes:
+    """Return the JSONL batch input with one chat request per prompt."""
+    lines = []
+    for prompt in prompts:
+        messages = []
+        if instructions:
+            messages.append({"role": "system", "content": instructions})
+        messages.append({"role": "user", "content": prompt["prompt"]})
+        body: dict[str, Any] = {"messages": messages}
+        if max_tokens:
+            body["max_tokens"] = max_tokens
+        lines.append(json.dumps({"custom_id": prompt["id"], "body": body}))
+    return "\n".join(lines).encode()
+
+
+def _parse_output_file(content: str) -> list[dict[str, Any]]:
+    """Return the results of a batch output or error file."""
+    results = []
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        result: dict[str, Any] = {
+            "id": record.get("custom_id"),
+            "content": None,
+            "error": record.get("error"),
+        }
+        response = record.get("response") or {}
+        if choices := (response.get("body") or {}).get("choices"):
+            result["content"] = choices[0]["message"]["content"]
+        elif result["error"] is None and response.get("status_code") != 200:
+            result["error"] = response.get("body")
+        results.append(result)
+    return results
+
+
+def _get_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, str | None]]:
+    """Return the store of the pending batch jobs of a config entry."""
+    return Store(hass, BATCH_STORAGE_VERSION, f"{DOMAIN}.batch_jobs.{entry_id}")
+
+
+async def async_remove_batch_jobs(hass: HomeAssistant, entry_id: str) -> None:
+    """Forget the pending batch jobs of a removed config entry."""
+    await _get_store(hass, entry_id).async_remove()
+
+
+class BatchJobTracker:
+    """Create batch jobs of a config entry and poll them, across restarts.
+
+    Pending jobs are persisted so polling resumes after a reload or a restart
+    of Home Assistant instead of losing the results. Any client with the
+    async files and batch API of the Mistral SDK can be used, such as a local
+    stand-in in tests.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: MistralConfigEntry, client: mistralai.Mistral
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.entry = entry
+        self.client = client
+        self._store = _get_store(hass, entry.entry_id)
+        # Output file of each pending job, by job id
+        self._jobs: dict[str, str | None] = {}
+
+    async def async_setup(self) -> None:
+        """Load the pending jobs and resume polling them."""
+        self._jobs = await self._store.async_load() or {}
+        for job_id in self._jobs:
+            LOGGER.debug("Resuming polling of Mistral batch job %s", job_id)
+            self._async_start_polling(job_id)
+
+    async def async_create_job(
+        self,
+        prompts: list[dict[str, str]],
+        model: str,
+        instructions: str | None = None,
+        max_tokens: int | None = None,
+        output_file: Path | None = None,
+    ) -> str:
+        """Queue the prompts as a Mistral batch job and return the job id.
+
+        The job is polled in the background. Once it is done, the results are
+        fired with an event and written to output_file when given.
+        """
+        try:
+            uploaded = await self.client.files.upload_async(
+                file={
+                    "file_name": "home_assistant_batch.jsonl",
+                    "content": _build_input_file(prompts, instructions, max_tokens),
+                },
+                purpose="batch",
+            )
+            job = await self.client.batch.jobs.create_async(
+                input_files=[uploaded.id],
+                endpoint="/v1/chat/completions",
+                model=model,
+                metadata={"source": "home_assistant"},
+            )
+        except mistralai.models.SDKError as err:
+            LOGGER.error("Error creating Mistral batch job: %s", err)
+            raise HomeAssistantError(f"Mistral API error: {err.message}") from err
+        except Exception as err:
+            LOGGER.error("Error creating Mistral batch job: %s", err)
+            raise HomeAssistantError(f"Error creating the batch job: {err}") from err
+
+        LOGGER.debug(
+            "Created Mistral batch job %s for %s prompts", job.id, len(prompts)
+        )
+        self.entry.runtime_data.stats.increment("batch", "jobs")
+        self.entry.runtime_data.stats.increment(
+            "batch", "prompts", value=len(prompts)
+        )
+        self._jobs[job.id] = str(output_file) if output_file else None
+        await self._store.async_save(self._jobs)
+        self._async_start_polling(job.id)
+        return job.id
+
+    @callback
+    def _async_start_polling(self, job_id: str) -> None:
+        """Poll a job in the background of the config entry."""
+        self.entry.async_create_background_task(
+            self.hass, self._async_poll(job_id), name=f"Mistral batch job {job_id}"
+        )
+
+    async def _async_poll(self, job_id: str) -> None:
+        """Wait for a batch job to finish, publish its results and forget it."""
+        output_file = self._jobs[job_id]
+        try:
+            status, results, error = await _async_wait_batch_job(self.client, job_id)
+        except Exception as err:
+            # The job is dropped, it would fail the same way on every restart
+            LOGGER.exception("Unexpected error polling Mistral batch job %s", job_id)
+            status, results, error = None, [], f"Unexpected error: {err}"
+
+        if output_file is not None and status is not None:
+            try:
+                await self.hass.async_add_executor_job(
+                    Path(output_file).write_text, json.dumps(results, indent=2)
+                )
+            except OSError as err:
+                LOGGER.error(
+                    "Error writing Mistral batch results to %s: %s", output_file, err
+                )
+                error = f"Error writing {output_file}: {err}"
+
+        LOGGER.debug("Mistral batch job %s finished with status %s", job_id, status)
+        self.hass.bus.async_fire(
+            EVENT_BATCH_COMPLETED,
+            {"job_id": job_id, "status": status, "results": results, "error": error},
+        )
+        del self._jobs[job_id]
+        await self._store.async_save(self._jobs)
+
+
+async def _async_wait_batch_job(
+    client: mistralai.Mistral, job_id: str
+) -> tuple[str | None, list[dict[str, Any]], str | None]:
+    """Wait for a batch job to finish and return its status, results and error."""
+    failures = 0
+    while True:
+        await asyncio.sleep(BATCH_POLL_INTERVAL)
+        try:
+            job = await client.batch.jobs.get_async(job_id=job_id)
+        except (mistralai.models.SDKError, httpx.HTTPError) as err:
+            failures += 1
+            LOGGER.warning("Error polling Mistral batch job %s: %s", job_id, err)
+            if failures >= BATCH_MAX_POLL_FAILURES:
+                return None, [], f"Error polling the batch job: {err}"
+            continue
+        failures = 0
+        if job.status in BATCH_FINAL_STATUSES:
+            break
+
+    results: list[dict[str, Any]] = []
+    error = None
+    for file_id in (job.output_file, job.error_file):
+        if not file_id:
+            continue
+        try:
+            response = await client.files.download_async(file_id=file_id)
+            try:
+                content = await response.aread()
+            finally:
+                await response.aclose()
+        except (mistralai.models.SDKError, httpx.HTTPError) as err:
+            LOGGER.error(
+                "Error downloading Mistral batch results %s: %s", job_id, err
+            )
+            error = f"Error downloading the batch results: {err}"
+            continue
+        try:
+            results.extend(_parse_output_file(content.decode()))
+        except ValueError as err:
+            LOGGER.error("Invalid Mistral batch results %s: %s", job_id, err)
+            error = f"Invalid batch results: {err}"
+    return job.status, results, error
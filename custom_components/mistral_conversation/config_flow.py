@@ -28,21 +28,57 @@ from homeassistant.helpers.selector import (
     SelectSelector,
     SelectSelectorConfig,
     TemplateSelector,
+    TextSelector,
+    TextSelectorConfig,
+    TextSelectorType,
 )
 
 from .const import (
+    BACKEND_SELECTION_LATENCY,
+    BACKEND_SELECTION_PRIMARY,
+    CONF_API_KEYS,
+    CONF_BACKEND_API_KEY,
+    CONF_BACKEND_MODEL,
+    CONF_BACKEND_SELECTION,
+    CONF_BACKEND_URL,
     CONF_CHAT_MODEL,
+    CONF_CHUNK_TIMEOUT,
+    CONF_CONNECT_TIMEOUT,
+    CONF_FALLBACK_CHAT_MODEL,
+    CONF_FIRST_TOKEN_TIMEOUT,
     CONF_MAX_TOKENS,
+    CONF_MEMORY,
+    CONF_MEMORY_RECENT_MESSAGES,
+    CONF_MEMORY_TOP_K,
+    CONF_PARTIAL_OUTPUT,
+    CONF_PREFER_LOCAL_INTENTS,
     CONF_PROMPT,
     CONF_RECOMMENDED,
+    CONF_STALL_RETRIES,
     CONF_TEMPERATURE,
     CONF_THINKING_BUDGET,
+    CONF_TOOL_CACHE_TTL,
+    CONF_TOTAL_TIMEOUT,
+    DEFAULT_AI_TASK_NAME,
     DEFAULT_CONVERSATION_NAME,
     DOMAIN,
+    PARTIAL_OUTPUT_DISCARD,
+    PARTIAL_OUTPUT_KEEP,
+    RECOMMENDED_AI_TASK_OPTIONS,
+    RECOMMENDED_BACKEND_SELECTION,
     RECOMMENDED_CHAT_MODEL,
+    RECOMMENDED_CHUNK_TIMEOUT,
+    RECOMMENDED_CONNECT_TIMEOUT,
+    RECOMMENDED_FIRST_TOKEN_TIMEOUT,
     RECOMMENDED_MAX_TOKENS,
+    RECOMMENDED_MEMORY_RECENT_MESSAGES,
+    RECOMMENDED_MEMORY_TOP_K,
+    RECOMMENDED_PARTIAL_OUTPUT,
+    RECOMMENDED_STALL_RETRIES,
     RECOMMENDED_TEMPERATURE,
     RECOMMENDED_THINKING_BUDGET,
+    RECOMMENDED_TOOL_CACHE_TTL,
+    RECOMMENDED_TOTAL_TIMEOUT,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -50,6 +86,9 @@ _LOGGER = logging.getLogger(__name__)
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_API_KEY): str,
+        vol.Optional(CONF_API_KEYS): TextSelector(
+            TextSelectorConfig(type=TextSelectorType.PASSWORD, multiple=True)
+        ),
     }
 )
 
@@ -64,18 +103,31 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> None:
     """Validate the user input allows us to connect.
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
+    Every API key of the pool is validated.
     """
-    client = await hass.async_add_executor_job(
-        partial(mistralai.Mistral, api_key=data[CONF_API_KEY])
-    )
-    await hass.async_add_executor_job(client.models.list)
+    for api_key in (data[CONF_API_KEY], *data.get(CONF_API_KEYS, [])):
+        client = await hass.async_add_executor_job(
+            partial(mistralai.Mistral, api_key=api_key)
+        )
+        await hass.async_add_executor_job(client.models.list)
+
+
+def _dedupe_api_keys(data: dict[str, Any]) -> dict[str, Any]:
+    """Return the data without repeated API keys in the key pool.
+
+    A repeated key would make the pool spread the load twice over the same
+    rate limit.
+    """
+    api_keys = dict.fromkeys(data.get(CONF_API_KEYS, []))
+    api_keys.pop(data[CONF_API_KEY], None)
+    return {**data, CONF_API_KEYS: list(api_keys)}
 
 
 class MistralConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Mistral."""
 
     VERSION = 2
-    MINOR_VERSION = 2
+    MINOR_VERSION = 3
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -84,22 +136,10 @@ class MistralConfigFlow(ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            self._async_abort_entries_match(user_input)
-            try:
-                await validate_input(self.hass, user_input)
-            except mistralai.models.SDKError as e:
-                if e.status_code == 401:
-                    errors["base"] = "authentication_error"
-                elif e.status_code == 422:
-                    errors["base"] = "invalid_auth"
-                elif e.status_code in (408, 504):
-                    errors["base"] = "timeout_connect"
-                else:
-                    errors["base"] = "cannot_connect"
-            except Exception:
-                _LOGGER.exception("Unexpected exception")
-                errors["base"] = "unknown"
-            else:
+            self._async_abort_entries_match({CONF_API_KEY: user_input[CONF_API_KEY]})
+            user_input = _dedupe_api_keys(user_input)
+            errors = await self._async_validate_input(user_input)
+            if not errors:
                 return self.async_create_entry(
                     title="Mistral",
                     data=user_input,
@@ -109,7 +149,13 @@ class MistralConfigFlow(ConfigFlow, domain=DOMAIN):
                             "data": RECOMMENDED_OPTIONS,
                             "title": DEFAULT_CONVERSATION_NAME,
                             "unique_id": None,
-                        }
+                        },
+                        {
+                            "subentry_type": "ai_task_data",
+                            "data": RECOMMENDED_AI_TASK_OPTIONS,
+                            "title": DEFAULT_AI_TASK_NAME,
+                            "unique_id": None,
+                        },
                     ],
                 )
 
@@ -117,17 +163,69 @@ class MistralConfigFlow(ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors or None
         )
 
+    async def async_step_reconfigure(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle reconfiguration of the API keys."""
+        entry = self._get_reconfigure_entry()
+        errors = {}
+
+        if user_input is not None:
+            # Migrations and the user step assume one entry per primary key
+            if user_input[CONF_API_KEY] != entry.data[CONF_API_KEY]:
+                self._async_abort_entries_match(
+                    {CONF_API_KEY: user_input[CONF_API_KEY]}
+                )
+            user_input = _dedupe_api_keys(user_input)
+            errors = await self._async_validate_input(user_input)
+            if not errors:
+                return self.async_update_reload_and_abort(
+                    entry, data={**entry.data, CONF_API_KEYS: [], **user_input}
+                )
+
+        return self.async_show_form(
+            step_id="reconfigure",
+            data_schema=self.add_suggested_values_to_schema(
+                STEP_USER_DATA_SCHEMA, entry.data
+            ),
+            errors=errors or None,
+        )
+
+    async def _async_validate_input(
+        self, user_input: dict[str, Any]
+    ) -> dict[str, str]:
+        """Validate the user input and return the errors."""
+        errors: dict[str, str] = {}
+        try:
+            await validate_input(self.hass, user_input)
+        except mistralai.models.SDKError as e:
+            if e.status_code == 401:
+                errors["base"] = "authentication_error"
+            elif e.status_code == 422:
+                errors["base"] = "invalid_auth"
+            elif e.status_code in (408, 504):
+                errors["base"] = "timeout_connect"
+            else:
+                errors["base"] = "cannot_connect"
+        except Exception:
+            _LOGGER.exception("Unexpected exception")
+            errors["base"] = "unknown"
+        return errors
+
     @classmethod
     @callback
     def async_get_supported_subentry_types(
         cls, config_entry: ConfigEntry
     ) -> dict[str, type[ConfigSubentryFlow]]:
         """Return subentries supported by this integration."""
-        return {"conversation": ConversationSubentryFlowHandler}
+        return {
+            "conversation": ConversationSubentryFlowHandler,
+            "ai_task_data": ConversationSubentryFlowHandler,
+        }
 
 
 class ConversationSubentryFlowHandler(ConfigSubentryFlow):
-    """Flow for managing conversation subentries."""
+    """Flow for managing conversation and AI task subentries."""
 
     last_rendered_recommended = False
 
@@ -147,7 +245,9 @@ class ConversationSubentryFlowHandler(ConfigSubentryFlow):
         errors: dict[str, str] = {}
 
         if user_input is None:
-            if self._is_new:
+            if self._is_new and self._subentry_type == "ai_task_data":
+                options = RECOMMENDED_AI_TASK_OPTIONS.copy()
+            elif self._is_new:
                 options = RECOMMENDED_OPTIONS.copy()
             else:
                 # If this is a reconfiguration, we need to copy the existing options
@@ -185,14 +285,23 @@ class ConversationSubentryFlowHandler(ConfigSubentryFlow):
             # Re-render the options again, now with the recommended options shown/hidden
             self.last_rendered_recommended = user_input[CONF_RECOMMENDED]
 
-            options = {
-                CONF_RECOMMENDED: user_input[CONF_RECOMMENDED],
-                CONF_PROMPT: user_input[CONF_PROMPT],
-                CONF_LLM_HASS_API: user_input.get(CONF_LLM_HASS_API),
-            }
+            options = {CONF_RECOMMENDED: user_input[CONF_RECOMMENDED]}
+            if self._subentry_type == "conversation":
+                options.update(
+                    {
+                        CONF_PROMPT: user_input[CONF_PROMPT],
+                        CONF_LLM_HASS_API: user_input.get(CONF_LLM_HASS_API),
+                        CONF_PREFER_LOCAL_INTENTS: user_input.get(
+                            CONF_PREFER_LOCAL_INTENTS, False
+                        ),
+                        CONF_MEMORY: user_input.get(CONF_MEMORY, False),
+                    }
+                )
 
         suggested_values = options.copy()
-        if not suggested_values.get(CONF_PROMPT):
+        if self._subentry_type == "conversation" and not suggested_values.get(
+            CONF_PROMPT
+        ):
             suggested_values[CONF_PROMPT] = llm.DEFAULT_INSTRUCTIONS_PROMPT
         if (
             suggested_llm_apis := suggested_values.get(CONF_LLM_HASS_API)
@@ -201,7 +310,9 @@ class ConversationSubentryFlowHandler(ConfigSubentryFlow):
 
         schema = self.add_suggested_values_to_schema(
             vol.Schema(
-                mistral_config_option_schema(self.hass, self._is_new, options)
+                mistral_config_option_schema(
+                    self.hass, self._is_new, self._subentry_type, options
+                )
             ),
             suggested_values,
         )
@@ -219,6 +330,7 @@ class ConversationSubentryFlowHandler(ConfigSubentryFlow):
 def mistral_config_option_schema(
     hass: HomeAssistant,
     is_new: bool,
+    subentry_type: str,
     options: Mapping[str, Any],
 ) -> dict:
     """Return a schema for Mistral completion options."""
@@ -232,22 +344,39 @@ def mistral_config_option_schema(
 
     if is_new:
         schema: dict[vol.Required | vol.Optional, Any] = {
-            vol.Required(CONF_NAME, default=DEFAULT_CONVERSATION_NAME): str,
+            vol.Required(
+                CONF_NAME,
+                default=DEFAULT_AI_TASK_NAME
+                if subentry_type == "ai_task_data"
+                else DEFAULT_CONVERSATION_NAME,
+            ): str,
         }
     else:
         schema = {}
 
-    schema.update(
-        {
-            vol.Optional(CONF_PROMPT): TemplateSelector(),
-            vol.Optional(
-                CONF_LLM_HASS_API,
-            ): SelectSelector(SelectSelectorConfig(options=hass_apis, multiple=True)),
-            vol.Required(
-                CONF_RECOMMENDED, default=options.get(CONF_RECOMMENDED, False)
-            ): bool,
-        }
-    )
+    if subentry_type == "conversation":
+        schema.update(
+            {
+                vol.Optional(CONF_PROMPT): TemplateSelector(),
+                vol.Optional(
+                    CONF_LLM_HASS_API,
+                ): SelectSelector(
+                    SelectSelectorConfig(options=hass_apis, multiple=True)
+                ),
+                vol.Optional(
+                    CONF_PREFER_LOCAL_INTENTS,
+                    default=options.get(CONF_PREFER_LOCAL_INTENTS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_MEMORY,
+                    default=options.get(CONF_MEMORY, False),
+                ): bool,
+            }
+        )
+
+    schema[
+        vol.Required(CONF_RECOMMENDED, default=options.get(CONF_RECOMMENDED, False))
+    ] = bool
 
     if options.get(CONF_RECOMMENDED):
         return schema
@@ -270,6 +399,78 @@ def mistral_config_option_schema(
                 CONF_THINKING_BUDGET,
                 default=RECOMMENDED_THINKING_BUDGET,
             ): int,
+            vol.Optional(
+                CONF_CONNECT_TIMEOUT,
+                default=RECOMMENDED_CONNECT_TIMEOUT,
+            ): NumberSelector(NumberSelectorConfig(min=0, max=300, step=0.5)),
+            vol.Optional(
+                CONF_FIRST_TOKEN_TIMEOUT,
+                default=RECOMMENDED_FIRST_TOKEN_TIMEOUT,
+            ): NumberSelector(NumberSelectorConfig(min=0, max=300, step=0.5)),
+            vol.Optional(
+                CONF_CHUNK_TIMEOUT,
+                default=RECOMMENDED_CHUNK_TIMEOUT,
+            ): NumberSelector(NumberSelectorConfig(min=0, max=300, step=0.5)),
+            vol.Optional(
+                CONF_TOTAL_TIMEOUT,
+                default=RECOMMENDED_TOTAL_TIMEOUT,
+            ): NumberSelector(NumberSelectorConfig(min=0, max=600, step=1)),
+            vol.Optional(
+                CONF_STALL_RETRIES,
+                default=RECOMMENDED_STALL_RETRIES,
+            ): NumberSelector(NumberSelectorConfig(min=0, max=5, step=1)),
+            vol.Optional(
+                CONF_FALLBACK_CHAT_MODEL,
+                default="",
+            ): str,
+            vol.Optional(
+                CONF_PARTIAL_OUTPUT,
+                default=RECOMMENDED_PARTIAL_OUTPUT,
+            ): SelectSelector(
+                SelectSelectorConfig(
+                    options=[PARTIAL_OUTPUT_DISCARD, PARTIAL_OUTPUT_KEEP],
+                    translation_key=CONF_PARTIAL_OUTPUT,
+                )
+            ),
+            vol.Optional(
+                CONF_TOOL_CACHE_TTL,
+                default=RECOMMENDED_TOOL_CACHE_TTL,
+            ): NumberSelector(NumberSelectorConfig(min=0, max=60, step=1)),
+            vol.Optional(
+                CONF_BACKEND_URL,
+                default="",
+            ): str,
+            vol.Optional(
+                CONF_BACKEND_MODEL,
+                default="",
+            ): str,
+            vol.Optional(CONF_BACKEND_API_KEY): TextSelector(
+                TextSelectorConfig(type=TextSelectorType.PASSWORD)
+            ),
+            vol.Optional(
+                CONF_BACKEND_SELECTION,
+                default=RECOMMENDED_BACKEND_SELECTION,
+            ): SelectSelector(
+                SelectSelectorConfig(
+                    options=[BACKEND_SELECTION_PRIMARY, BACKEND_SELECTION_LATENCY],
+                    translation_key=CONF_BACKEND_SELECTION,
+                )
+            ),
         }
     )
+
+    if subentry_type == "conversation":
+        schema.update(
+            {
+                vol.Optional(
+                    CONF_MEMORY_TOP_K,
+                    default=RECOMMENDED_MEMORY_TOP_K,
+                ): NumberSelector(NumberSelectorConfig(min=1, max=50, step=1)),
+                vol.Optional(
+                    CONF_MEMORY_RECENT_MESSAGES,
+                    default=RECOMMENDED_MEMORY_RECENT_MESSAGES,
+                ): NumberSelector(NumberSelectorConfig(min=0, max=100, step=1)),
+            }
+        )
+
     return schema
@@ -6,8 +6,12 @@ DOMAIN = "mistral_conversation"
 LOGGER = logging.getLogger(__package__)
 
 DEFAULT_CONVERSATION_NAME = "Mistral conversation"
+DEFAULT_AI_TASK_NAME = "Mistral AI Task"
 
 CONF_RECOMMENDED = "recommended"
+RECOMMENDED_AI_TASK_OPTIONS = {
+    CONF_RECOMMENDED: True,
+}
 CONF_PROMPT = "prompt"
 CONF_CHAT_MODEL = "chat_model"
 RECOMMENDED_CHAT_MODEL = "mistral-small-latest"
@@ -24,3 +28,85 @@ THINKING_MODELS = [
     "mistral-large-2411",
     "mistral-medium-latest",
 ]
+
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+RECOMMENDED_CONNECT_TIMEOUT = 10.0
+CONF_FIRST_TOKEN_TIMEOUT = "first_token_timeout"
+RECOMMENDED_FIRST_TOKEN_TIMEOUT = 30.0
+CONF_CHUNK_TIMEOUT = "chunk_timeout"
+RECOMMENDED_CHUNK_TIMEOUT = 10.0
+CONF_TOTAL_TIMEOUT = "total_timeout"
+RECOMMENDED_TOTAL_TIMEOUT = 120.0
+CONF_STALL_RETRIES = "stall_retries"
+RECOMMENDED_STALL_RETRIES = 1
+CONF_FALLBACK_CHAT_MODEL = "fallback_chat_model"
+CONF_PARTIAL_OUTPUT = "partial_output"
+PARTIAL_OUTPUT_DISCARD = "discard"
+PARTIAL_OUTPUT_KEEP = "keep"
+RECOMMENDED_PARTIAL_OUTPUT = PARTIAL_OUTPUT_DISCARD
+
+CONF_TOOL_CACHE_TTL = "tool_cache_ttl"
+RECOMMENDED_TOOL_CACHE_TTL = 0
+
+# Tools that only read state and can be served from the tool result cache
+READ_ONLY_TOOLS = [
+    "GetLiveContext",
+    "todo_get_items",
+    "calendar_get_events",
+]
+
+CONF_PREFER_LOCAL_INTENTS = "prefer_local_intents"
+# Weight of the latest turn in the moving average of the LLM response time
+LLM_LATENCY_SMOOTHING = 0.2
+
+# System prompt lines that change from one turn to the next
+DYNAMIC_PROMPT_PATTERNS = [
+    r"^Current time is ",
+    r"^Today's date is ",
+    r"^The current (date|time) is ",
+]
+
+CONF_API_KEYS = "api_keys"
+# Seconds an API key is left out of the pool after an error
+KEY_AUTH_FAILURE_COOLDOWN = 600
+KEY_RATE_LIMIT_COOLDOWN = 30
+# Response headers reporting the remaining rate budget of an API key
+RATE_LIMIT_REMAINING_HEADERS = [
+    "x-ratelimit-remaining-tokens-minute",
+    "x-ratelimitbysize-remaining-minute",
+    "ratelimitbysize-remaining",
+]
+
+SERVICE_GENERATE_BATCH = "generate_batch"
+EVENT_BATCH_COMPLETED = f"{DOMAIN}_batch_completed"
+# Seconds between two status checks of a batch job
+BATCH_POLL_INTERVAL = 60
+BATCH_FINAL_STATUSES = ["SUCCESS", "FAILED", "TIMEOUT_EXCEEDED", "CANCELLED"]
+# Consecutive failed status checks after which a batch job is given up
+BATCH_MAX_POLL_FAILURES = 10
+BATCH_STORAGE_VERSION = 1
+
+CONF_MEMORY = "memory"
+CONF_MEMORY_TOP_K = "memory_top_k"
+RECOMMENDED_MEMORY_TOP_K = 5
+CONF_MEMORY_RECENT_MESSAGES = "memory_recent_messages"
+RECOMMENDED_MEMORY_RECENT_MESSAGES = 6
+MEMORY_EMBEDDING_MODEL = "mistral-embed"
+# Memories less similar than this to the request are not recalled
+MEMORY_MIN_SIMILARITY = 0.5
+# Seconds to wait for the memories of a request before answering without
+MEMORY_RECALL_TIMEOUT = 3
+
+EVENT_AI_TASK_FIELD = f"{DOMAIN}_ai_task_field"
+
+CONF_BACKEND_URL = "backend_url"
+CONF_BACKEND_MODEL = "backend_model"
+CONF_BACKEND_API_KEY = "backend_api_key"
+CONF_BACKEND_SELECTION = "backend_selection"
+BACKEND_SELECTION_PRIMARY = "primary"
+BACKEND_SELECTION_LATENCY = "lowest_latency"
+RECOMMENDED_BACKEND_SELECTION = BACKEND_SELECTION_PRIMARY
+# Seconds a backend is skipped after a failed request
+BACKEND_FAILURE_COOLDOWN = 60
+# Weight of the latest request in the moving average of the first token latency
+BACKEND_LATENCY_SMOOTHING = 0.2
@@ -1,17 +1,30 @@
 """Conversation support for Mistral"""
 
-from typing import Literal
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Literal
 
 from homeassistant.components import conversation
 from homeassistant.config_entries import ConfigSubentry
 from homeassistant.const import CONF_LLM_HASS_API, MATCH_ALL
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import intent
 from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
 
 from . import MistralConfigEntry
-from .const import CONF_PROMPT, DOMAIN
+from .const import (
+    CONF_PREFER_LOCAL_INTENTS,
+    CONF_PROMPT,
+    DOMAIN,
+    LLM_LATENCY_SMOOTHING,
+    LOGGER,
+)
 from .entity import MistralBaseLLMEntity
 
+if TYPE_CHECKING:
+    from hassil.recognize import RecognizeResult
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -41,6 +54,8 @@ class MistralConversationEntity(
     def __init__(self, entry: MistralConfigEntry, subentry: ConfigSubentry) -> None:
         """Initialize the agent."""
         super().__init__(entry, subentry)
+        # Moving average of the LLM response time, in seconds
+        self._llm_latency: float | None = None
         if self.subentry.data.get(CONF_LLM_HASS_API):
             self._attr_supported_features = (
                 conversation.ConversationEntityFeature.CONTROL
@@ -59,6 +74,11 @@ class MistralConversationEntity(
         """Call the API."""
         options = self.subentry.data
 
+        if options.get(CONF_PREFER_LOCAL_INTENTS) and (
+            result := await self._async_handle_local_intents(user_input, chat_log)
+        ):
+            return result
+
         try:
             await chat_log.async_provide_llm_data(
                 user_input.as_llm_context(DOMAIN),
@@ -69,6 +89,74 @@ class MistralConversationEntity(
         except conversation.ConverseError as err:
             return err.as_conversation_result()
 
+        start = time.monotonic()
         await self._async_handle_chat_log(chat_log)
+        latency = time.monotonic() - start
+        if self._llm_latency is None:
+            self._llm_latency = latency
+        else:
+            self._llm_latency += LLM_LATENCY_SMOOTHING * (latency - self._llm_latency)
 
         return conversation.async_get_result_from_chat_log(user_input, chat_log)
+
+    async def _async_handle_local_intents(
+        self,
+        user_input: conversation.ConversationInput,
+        chat_log: conversation.ChatLog,
+    ) -> conversation.ConversationResult | None:
+        """Handle the input with the local intent matcher.
+
+        Returns None when the input needs the LLM.
+        """
+        stats = self.entry.runtime_data.stats
+        start = time.monotonic()
+        intent_response = await conversation.async_handle_intents(
+            self.hass, user_input, intent_filter=_local_intent_filter
+        )
+        local_latency = time.monotonic() - start
+
+        if (
+            intent_response is None
+            or intent_response.response_type == intent.IntentResponseType.ERROR
+        ):
+            stats.increment("local_intent", "miss")
+            return None
+
+        stats.increment("local_intent", "hit")
+        stats.increment("local_intent", "latency_seconds", value=local_latency)
+        if self._llm_latency is not None:
+            stats.increment(
+                "local_intent",
+                "latency_saved_seconds",
+                value=max(self._llm_latency - local_latency, 0),
+            )
+        LOGGER.debug(
+            "Handled locally in %.3fs (hit rate %.0f%%)",
+            local_latency,
+            100
+            * stats.get("local_intent", "hit")
+            / (stats.get("local_intent", "hit") + stats.get("local_intent", "miss")),
+        )
+
+        # Keep the exchange in the chat log so later LLM turns have context
+        speech = intent_response.speech.get("plain", {}).get("speech", "")
+        chat_log.async_add_llm_message(
+            conversation.LLMMessage(
+                content=speech,
+                role="assistant",
+            )
+        )
+
+        return conversation.ConversationResult(
+            response=intent_response,
+            conversation_id=chat_log.conversation_id,
+        )
+
+
+@callback
+def _local_intent_filter(result: RecognizeResult) -> bool:
+    """Return if a local match should be left to the LLM.
+
+    Questions about states are answered better by the LLM.
+    """
+    return result.intent.name == intent.INTENT_GET_STATE
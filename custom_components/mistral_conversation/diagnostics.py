@@ -0,0 +1,33 @@
+"""Diagnostics support for the Mistral integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+from . import MistralConfigEntry
+from .const import CONF_API_KEYS, CONF_BACKEND_API_KEY
+
+TO_REDACT = {CONF_API_KEY, CONF_API_KEYS, CONF_BACKEND_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: MistralConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    return {
+        "data": async_redact_data(entry.data, TO_REDACT),
+        "subentries": {
+            subentry.subentry_id: {
+                "subentry_type": subentry.subentry_type,
+                "title": subentry.title,
+                "data": async_redact_data(subentry.data, TO_REDACT),
+            }
+            for subentry in entry.subentries.values()
+        },
+        "api_keys": [key.as_dict() for key in entry.runtime_data.key_pool.keys],
+        "counters": entry.runtime_data.stats.as_dict(),
+    }
@@ -2,35 +2,79 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator, Callable
 import json
 import logging
+import time
 from typing import Any
 
 import mistralai
+import numpy as np
 import voluptuous as vol
 from voluptuous_openapi import convert
 
 from homeassistant.components import conversation
 from homeassistant.config_entries import ConfigEntry, ConfigSubentry
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity import Entity
-from homeassistant.util import ulid
 
 from . import MistralConfigEntry
+from .backends import (
+    LLMBackend,
+    MistralBackend,
+    OpenAICompatibleBackend,
+    StreamDelta,
+    is_failover_error,
+)
 from .const import (
+    BACKEND_SELECTION_LATENCY,
+    CONF_BACKEND_API_KEY,
+    CONF_BACKEND_MODEL,
+    CONF_BACKEND_SELECTION,
+    CONF_BACKEND_URL,
     CONF_CHAT_MODEL,
+    CONF_CHUNK_TIMEOUT,
+    CONF_CONNECT_TIMEOUT,
+    CONF_FALLBACK_CHAT_MODEL,
+    CONF_FIRST_TOKEN_TIMEOUT,
     CONF_MAX_TOKENS,
+    CONF_MEMORY,
+    CONF_MEMORY_RECENT_MESSAGES,
+    CONF_MEMORY_TOP_K,
+    CONF_PARTIAL_OUTPUT,
     CONF_RECOMMENDED,
+    CONF_STALL_RETRIES,
     CONF_TEMPERATURE,
     CONF_THINKING_BUDGET,
+    CONF_TOOL_CACHE_TTL,
+    CONF_TOTAL_TIMEOUT,
     LOGGER,
+    MEMORY_EMBEDDING_MODEL,
+    MEMORY_RECALL_TIMEOUT,
     MIN_THINKING_BUDGET,
+    PARTIAL_OUTPUT_KEEP,
+    READ_ONLY_TOOLS,
+    RECOMMENDED_BACKEND_SELECTION,
     RECOMMENDED_CHAT_MODEL,
+    RECOMMENDED_CHUNK_TIMEOUT,
+    RECOMMENDED_CONNECT_TIMEOUT,
+    RECOMMENDED_FIRST_TOKEN_TIMEOUT,
     RECOMMENDED_MAX_TOKENS,
+    RECOMMENDED_MEMORY_RECENT_MESSAGES,
+    RECOMMENDED_MEMORY_TOP_K,
+    RECOMMENDED_PARTIAL_OUTPUT,
+    RECOMMENDED_STALL_RETRIES,
     RECOMMENDED_TEMPERATURE,
     RECOMMENDED_THINKING_BUDGET,
+    RECOMMENDED_TOOL_CACHE_TTL,
+    RECOMMENDED_TOTAL_TIMEOUT,
     THINKING_MODELS,
 )
+from .memory import ConversationMemory, get_memory_path
+from .prompt import PrefixTracker, layout_messages, trim_history
+from .stream import StreamStalledError, StreamTimeouts
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +91,96 @@ class MistralBaseLLMEntity(Entity):
         self.subentry = subentry
         self._attr_unique_id = subentry.subentry_id
         self._attr_device_info = self._device_info()
+        self._prefix_tracker = PrefixTracker()
+        self._memory: ConversationMemory | None = None
+        self._backends: list[LLMBackend] = []
+
+    async def async_added_to_hass(self) -> None:
+        """Set up the backends and load the long-term memory when enabled."""
+        await super().async_added_to_hass()
+        self._backends = [MistralBackend(self.entry)]
+        if backend_url := self._get_option(CONF_BACKEND_URL, ""):
+            self._backends.append(
+                OpenAICompatibleBackend(
+                    self.hass,
+                    backend_url,
+                    self._get_option(CONF_BACKEND_MODEL, ""),
+                    self._get_option(CONF_BACKEND_API_KEY, ""),
+                )
+            )
+
+        if self.subentry.data.get(CONF_MEMORY):
+            self._memory = ConversationMemory(
+                self.hass,
+                get_memory_path(self.hass, self.subentry.subentry_id),
+                self._async_embed,
+            )
+            await self._memory.async_load()
+
+    async def _async_embed(self, texts: list[str]) -> np.ndarray:
+        """Return the Mistral embeddings of the texts."""
+        async with self.entry.runtime_data.key_pool.async_acquire() as key:
+            response = await key.client.embeddings.create_async(
+                model=MEMORY_EMBEDDING_MODEL, inputs=texts
+            )
+        return np.array([item.embedding for item in response.data], np.float32)
+
+    async def _async_recall_memories(
+        self, chat_log: conversation.ChatLog
+    ) -> list[str]:
+        """Return the memories relevant to the latest user message."""
+        if self._memory is None:
+            return []
+        query = next(
+            (
+                message.content
+                for message in reversed(chat_log.messages)
+                if message.role == "user"
+            ),
+            "",
+        )
+        # Memories are optional, they must not hold up or fail the answer
+        try:
+            async with asyncio.timeout(MEMORY_RECALL_TIMEOUT):
+                return await self._memory.async_recall(
+                    query,
+                    int(self._get_option(CONF_MEMORY_TOP_K, RECOMMENDED_MEMORY_TOP_K)),
+                )
+        except Exception as err:
+            LOGGER.warning("Error recalling memories: %r", err)
+            return []
+
+    @callback
+    def _async_remember_turn(
+        self, chat_log: conversation.ChatLog, response: str
+    ) -> None:
+        """Store the latest exchange in the long-term memory, in the background."""
+        if self._memory is None:
+            return
+        query = next(
+            (
+                message.content
+                for message in reversed(chat_log.messages)
+                if message.role == "user"
+            ),
+            "",
+        )
+        self.entry.async_create_background_task(
+            self.hass,
+            self._async_remember(
+                self._memory, [f"User: {query}\nAssistant: {response}"]
+            ),
+            name=f"Mistral memory {self.subentry.subentry_id}",
+        )
+
+    async def _async_remember(
+        self, memory: ConversationMemory, texts: list[str]
+    ) -> None:
+        """Store memories, logging failures instead of raising them."""
+        try:
+            await memory.async_remember(texts)
+        except Exception as err:
+            LOGGER.warning("Error storing memories: %r", err)
 
     def _device_info(self) -> dict[str, Any]:
         """Return device information."""
@@ -69,38 +203,77 @@ class MistralBaseLLMEntity(Entity):
         """Return the name of the entity."""
         return self.subentry.title
 
+    def _get_option(self, key: str, recommended: Any) -> Any:
+        """Return an option, or its recommended value in recommended mode."""
+        options = self.subentry.data
+        if options.get(CONF_RECOMMENDED, False):
+            return recommended
+        return options.get(key, recommended)
+
+    def _get_stream_timeouts(self) -> StreamTimeouts:
+        """Return the configured stream timeouts."""
+        return StreamTimeouts(
+            connect=self._get_option(
+                CONF_CONNECT_TIMEOUT, RECOMMENDED_CONNECT_TIMEOUT
+            ),
+            first_token=self._get_option(
+                CONF_FIRST_TOKEN_TIMEOUT, RECOMMENDED_FIRST_TOKEN_TIMEOUT
+            ),
+            chunk=self._get_option(CONF_CHUNK_TIMEOUT, RECOMMENDED_CHUNK_TIMEOUT),
+            total=self._get_option(CONF_TOTAL_TIMEOUT, RECOMMENDED_TOTAL_TIMEOUT),
+        )
+
     async def _async_handle_chat_log(
-        self, chat_log: conversation.ChatLog
+        self,
+        chat_log: conversation.ChatLog,
+        response_format: dict[str, Any] | None = None,
+        content_callback: Callable[[str], None] | None = None,
     ) -> None:
-        """Handle the chat log and generate a response."""
-        client: mistralai.Mistral = self.entry.runtime_data
-        options = self.subentry.data
+        """Handle the chat log and generate a response.
+
+        content_callback is called with the content received so far each time
+        the streamed content grows.
+        """
+        runtime_data = self.entry.runtime_data
 
         # Get configuration
         model = self._get_model_name()
-        temperature = (
-            RECOMMENDED_TEMPERATURE
-            if options.get(CONF_RECOMMENDED, False)
-            else options.get(CONF_TEMPERATURE, RECOMMENDED_TEMPERATURE)
+        temperature = self._get_option(CONF_TEMPERATURE, RECOMMENDED_TEMPERATURE)
+        max_tokens = self._get_option(CONF_MAX_TOKENS, RECOMMENDED_MAX_TOKENS)
+        thinking_budget = self._get_option(
+            CONF_THINKING_BUDGET, RECOMMENDED_THINKING_BUDGET
         )
-        max_tokens = (
-            RECOMMENDED_MAX_TOKENS
-            if options.get(CONF_RECOMMENDED, False)
-            else options.get(CONF_MAX_TOKENS, RECOMMENDED_MAX_TOKENS)
+        timeouts = self._get_stream_timeouts()
+        stall_retries = self._get_option(
+            CONF_STALL_RETRIES, RECOMMENDED_STALL_RETRIES
         )
-        thinking_budget = (
-            RECOMMENDED_THINKING_BUDGET
-            if options.get(CONF_RECOMMENDED, False)
-            else options.get(CONF_THINKING_BUDGET, RECOMMENDED_THINKING_BUDGET)
+        fallback_model = self._get_option(CONF_FALLBACK_CHAT_MODEL, "")
+        partial_output = self._get_option(
+            CONF_PARTIAL_OUTPUT, RECOMMENDED_PARTIAL_OUTPUT
         )
 
         # Convert messages to Mistral format
-        messages = self._convert_messages(chat_log.messages)
+        memories = await self._async_recall_memories(chat_log)
+        messages = self._convert_messages(chat_log.messages, memories)
 
-        # Prepare tools if available
+        # Prepare tools if available, in a deterministic order
         tools = None
         if chat_log.tools:
-            tools = [self._convert_tool(tool) for tool in chat_log.tools]
+            tools = [
+                self._convert_tool(tool)
+                for tool in sorted(chat_log.tools, key=lambda tool: tool.name)
+            ]
+
+        stable, shared = self._prefix_tracker.record(tools, messages)
+        runtime_data.stats.increment(
+            "prompt_prefix", "stable" if stable else "changed"
+        )
+        runtime_data.stats.increment(
+            "prompt_prefix", "shared_messages", value=shared
+        )
+        runtime_data.stats.increment(
+            "prompt_prefix", "messages", value=len(messages)
+        )
 
         # Build request parameters
         request_params = {
@@ -115,67 +288,193 @@ class MistralBaseLLMEntity(Entity):
         if tools:
             request_params["tools"] = tools
 
-        # Add thinking budget for thinking models
-        if model in THINKING_MODELS and thinking_budget >= MIN_THINKING_BUDGET:
-            request_params["thinking_budget"] = thinking_budget
+        # Constrain the output, for example to a JSON schema
+        if response_format:
+            request_params["response_format"] = response_format
 
-        try:
-            # Stream the response
-            stream = await self.hass.async_add_executor_job(
-                lambda: client.chat.stream(**request_params)
+        # Retry stalled streams on the same model, then on the fallback model
+        attempt_models = [model] * (1 + max(0, int(stall_retries)))
+        if fallback_model and fallback_model != model:
+            attempt_models.append(fallback_model)
+
+        partial_content = ""
+        stream_response = True
+        stall_error: StreamStalledError | None = None
+
+        for attempt_model in attempt_models:
+            attempt_params = {**request_params, "model": attempt_model}
+
+            # Add thinking budget for thinking models
+            if (
+                attempt_model in THINKING_MODELS
+                and thinking_budget >= MIN_THINKING_BUDGET
+            ):
+                attempt_params["thinking_budget"] = thinking_budget
+
+            # Let the model continue the partial output of a stalled attempt
+            if partial_content:
+                attempt_params["messages"] = [
+                    *messages,
+                    {"role": "assistant", "content": partial_content, "prefix": True},
+                ]
+
+            try:
+                stream = self._async_stream_deltas(attempt_params, timeouts)
+
+                # Process streaming response
+                await self._process_stream(
+                    stream,
+                    chat_log,
+                    partial_content,
+                    response_format,
+                    content_callback,
+                    stream_response,
+                )
+                return
+
+            except StreamStalledError as err:
+                runtime_data.stats.increment("stream_stall", err.phase, attempt_model)
+                LOGGER.warning(
+                    "Mistral stream stalled during %s phase using model %s",
+                    err.phase,
+                    attempt_model,
+                )
+                if partial_output == PARTIAL_OUTPUT_KEEP:
+                    partial_content = err.partial_content
+                elif err.partial_content:
+                    # The discarded output was already streamed, so the retry
+                    # is not streamed on top of it, only added once complete
+                    stream_response = False
+                stall_error = err
+            except mistralai.models.SDKError as err:
+                if err.status_code == 422:
+                    error_msg = f"Invalid request parameters: {err.message}"
+                elif err.status_code == 401:
+                    error_msg = "Authentication failed. Please check your API key."
+                elif err.status_code == 429:
+                    error_msg = "Rate limit exceeded. Please try again later."
+                else:
+                    error_msg = f"Mistral API error: {err.message}"
+
+                LOGGER.error("Error calling Mistral API: %s", error_msg)
+                raise HomeAssistantError(error_msg) from err
+            except HomeAssistantError:
+                raise
+            except Exception as err:
+                LOGGER.error("Unexpected error calling Mistral API: %s", err)
+                raise HomeAssistantError(f"Unexpected error: {err}") from err
+
+        LOGGER.error("Mistral stream stalled after %s attempts", len(attempt_models))
+        raise HomeAssistantError(
+            "The Mistral response timed out. Please try again later."
+        ) from stall_error
+
+    def _get_backends(self) -> list[LLMBackend]:
+        """Return the backends to try for a request, in order."""
+        if len(self._backends) < 2:
+            return self._backends
+        backends = sorted(self._backends, key=lambda backend: not backend.healthy)
+        if (
+            self._get_option(CONF_BACKEND_SELECTION, RECOMMENDED_BACKEND_SELECTION)
+            == BACKEND_SELECTION_LATENCY
+        ):
+            # Backends without a measured latency are tried first to measure it
+            backends.sort(
+                key=lambda backend: (not backend.healthy, backend.latency or 0)
             )
-            
-            # Process streaming response
-            await self._process_stream(stream, chat_log)
-
-        except mistralai.models.SDKError as err:
-            if err.status_code == 422:
-                error_msg = f"Invalid request parameters: {err.message}"
-            elif err.status_code == 401:
-                error_msg = "Authentication failed. Please check your API key."
-            elif err.status_code == 429:
-                error_msg = "Rate limit exceeded. Please try again later."
-            else:
-                error_msg = f"Mistral API error: {err.message}"
-            
-            LOGGER.error("Error calling Mistral API: %s", error_msg)
-            raise HomeAssistantError(error_msg) from err
-        except Exception as err:
-            LOGGER.error("Unexpected error calling Mistral API: %s", err)
-            raise HomeAssistantError(f"Unexpected error: {err}") from err
+        return backends
+
+    async def _async_stream_deltas(
+        self, request_params: dict[str, Any], timeouts: StreamTimeouts
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream the response, failing over to the next backend on errors.
+
+        A backend is only left before it has streamed anything, so partial
+        output is never mixed from two backends, and only on errors another
+        backend may not hit: a rejected request is not replayed elsewhere.
+        """
+        stats = self.entry.runtime_data.stats
+        backends = self._get_backends()
+
+        for index, backend in enumerate(backends):
+            start = time.monotonic()
+            started = False
+            try:
+                async for delta in backend.async_stream(request_params, timeouts):
+                    # Role-only and usage chunks carry no output yet
+                    if not started and delta.has_token:
+                        started = True
+                        backend.report_latency(time.monotonic() - start)
+                    if delta.usage:
+                        for usage_type, tokens in delta.usage.items():
+                            stats.increment(
+                                "usage", backend.name, usage_type, value=tokens
+                            )
+                    yield delta
+                return
+            except Exception as err:
+                if (
+                    started
+                    or index == len(backends) - 1
+                    or not is_failover_error(err)
+                ):
+                    raise
+                if isinstance(err, StreamStalledError):
+                    # Counted here, as the stall retries never see this stall
+                    stats.increment(
+                        "stream_stall", err.phase, request_params["model"]
+                    )
+                backend.report_failure()
+                stats.increment("backend", "failover", backend.name)
+                LOGGER.warning(
+                    "Backend %s failed, trying %s: %s",
+                    backend.name,
+                    backends[index + 1].name,
+                    err,
+                )
 
     async def _process_stream(
-        self, stream, chat_log: conversation.ChatLog
+        self,
+        stream: AsyncIterator[StreamDelta],
+        chat_log: conversation.ChatLog,
+        partial_content: str = "",
+        response_format: dict[str, Any] | None = None,
+        content_callback: Callable[[str], None] | None = None,
+        stream_response: bool = True,
     ) -> None:
-        """Process the streaming response from Mistral."""
-        collected_content = ""
+        """Process the streaming response.
+
+        partial_content is output kept from a stalled attempt which the model
+        continues; it has already been streamed to the chat log. When
+        stream_response is False, the content is only added to the chat log
+        once the response is complete.
+        """
+        collected_content = partial_content
         tool_calls = []
-        
-        for chunk in stream:
-            if chunk.data and chunk.data.choices:
-                delta = chunk.data.choices[0].delta
-                
+
+        try:
+            async for delta in stream:
                 if delta.content:
                     collected_content += delta.content
                     # Stream content to chat log
-                    chat_log.async_update_response_stream(delta.content)
-                
-                if delta.tool_calls:
-                    # Handle tool calls
-                    for tool_call in delta.tool_calls:
-                        if tool_call.function:
-                            tool_calls.append({
-                                "id": tool_call.id or ulid.ulid(),
-                                "function": {
-                                    "name": tool_call.function.name,
-                                    "arguments": tool_call.function.arguments,
-                                },
-                                "type": "function",
-                            })
+                    if stream_response:
+                        chat_log.async_update_response_stream(delta.content)
+                    if content_callback is not None:
+                        content_callback(collected_content)
+
+                # Handle tool calls
+                tool_calls.extend(delta.tool_calls)
+        except StreamStalledError as err:
+            # Half-received tool calls can not be continued
+            if not tool_calls:
+                err.partial_content = collected_content
+            raise
 
         # Process any tool calls
         if tool_calls:
-            await self._handle_tool_calls(tool_calls, chat_log)
+            await self._handle_tool_calls(
+                tool_calls, chat_log, response_format, content_callback
+            )
         elif collected_content:
             # Add the final response to chat log
             chat_log.async_add_llm_message(
@@ -184,9 +483,14 @@ class MistralBaseLLMEntity(Entity):
                     role="assistant",
                 )
             )
+            self._async_remember_turn(chat_log, collected_content)
 
     async def _handle_tool_calls(
-        self, tool_calls: list[dict[str, Any]], chat_log: conversation.ChatLog
+        self,
+        tool_calls: list[dict[str, Any]],
+        chat_log: conversation.ChatLog,
+        response_format: dict[str, Any] | None = None,
+        content_callback: Callable[[str], None] | None = None,
     ) -> None:
         """Handle tool calls from the LLM."""
         # Add the assistant message with tool calls
@@ -198,6 +502,10 @@ class MistralBaseLLMEntity(Entity):
             )
         )
 
+        runtime_data = self.entry.runtime_data
+        tool_cache = runtime_data.tool_cache
+        cache_ttl = self._get_option(CONF_TOOL_CACHE_TTL, RECOMMENDED_TOOL_CACHE_TTL)
+
         # Execute the tools and add results
         for tool_call in tool_calls:
             function_name = tool_call["function"]["name"]
@@ -207,11 +515,27 @@ class MistralBaseLLMEntity(Entity):
                 # Parse arguments if they're a string
                 if isinstance(function_args, str):
                     function_args = json.loads(function_args)
-                
-                # Execute the tool
-                tool_result = await chat_log.async_tool_call(
-                    tool_call["id"], function_name, function_args
-                )
+
+                read_only = function_name in READ_ONLY_TOOLS
+                cached = False
+                if read_only and cache_ttl:
+                    cached, tool_result = tool_cache.async_get(
+                        function_name, function_args, cache_ttl
+                    )
+                    runtime_data.stats.increment(
+                        "tool_cache", "hit" if cached else "miss", function_name
+                    )
+
+                if not cached:
+                    # Execute the tool
+                    tool_result = await chat_log.async_tool_call(
+                        tool_call["id"], function_name, function_args
+                    )
+                    if not read_only:
+                        # The tool may have changed what cached results report
+                        tool_cache.async_invalidate()
+                    elif cache_ttl:
+                        tool_cache.async_set(function_name, function_args, tool_result)
                 
                 # Add tool result to chat log
                 chat_log.async_add_llm_message(
@@ -233,12 +557,19 @@ class MistralBaseLLMEntity(Entity):
                 )
 
         # Make another API call to get the final response
-        await self._async_handle_chat_log(chat_log)
+        await self._async_handle_chat_log(chat_log, response_format, content_callback)
 
     def _convert_messages(
-        self, messages: list[conversation.LLMMessage]
+        self,
+        messages: list[conversation.LLMMessage],
+        memories: list[str] | None = None,
     ) -> list[dict[str, Any]]:
-        """Convert Home Assistant messages to Mistral format."""
+        """Convert Home Assistant messages to Mistral format.
+
+        With the long-term memory enabled, only the recent history is sent
+        along with the recalled memories. The messages are laid out to keep
+        the request prefix stable between turns, see prompt.layout_messages.
+        """
         mistral_messages = []
         
         for message in messages:
@@ -272,8 +603,24 @@ class MistralBaseLLMEntity(Entity):
                     "role": message.role,
                     "content": message.content,
                 })
-        
-        return mistral_messages
+
+        context = []
+        if self._memory is not None:
+            mistral_messages = trim_history(
+                mistral_messages,
+                int(
+                    self._get_option(
+                        CONF_MEMORY_RECENT_MESSAGES, RECOMMENDED_MEMORY_RECENT_MESSAGES
+                    )
+                ),
+            )
+            if memories:
+                context.append(
+                    "Relevant memories from earlier conversations:\n"
+                    + "\n".join(f"- {memory}" for memory in memories)
+                )
+
+        return layout_messages(mistral_messages, context)
 
     def _convert_tool(self, tool: conversation.Tool) -> dict[str, Any]:
         """Convert Home Assistant tool to Mistral function format."""
@@ -0,0 +1,110 @@
+"""Incremental parser exposing fields of a streamed JSON object."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+
+class IncrementalJSONObjectParser:
+    """Parse a JSON object as it streams in and report its completed fields.
+
+    Only the top-level fields are reported, each one as soon as its value is
+    complete: strings, objects and arrays at their closing character, other
+    values at the following comma or closing brace.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self._fields: dict[str, Any] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        """Reset the parsing state, keeping the completed fields."""
+        self._buffer = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expecting_key = False
+        self._token_start = 0
+        self._key: str | None = None
+        self._value_start: int | None = None
+
+    @property
+    def fields(self) -> dict[str, Any]:
+        """Return the completed fields."""
+        return self._fields
+
+    def feed_text(self, text: str) -> list[tuple[str, Any]]:
+        """Parse the text received so far and return the newly completed fields.
+
+        The parser starts over when the text does not extend the text it has
+        seen, for example after a retried request. Fields completed again
+        with the same value are not reported twice.
+        """
+        if not text.startswith(self._buffer):
+            self._reset()
+        return self.feed(text[len(self._buffer) :])
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Parse the next chunk and return the newly completed fields."""
+        self._buffer += chunk
+        completed: list[tuple[str, Any]] = []
+
+        while self._position < len(self._buffer):
+            index = self._position
+            char = self._buffer[index]
+            self._position += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expecting_key:
+                        self._key = json.loads(
+                            self._buffer[self._token_start : index + 1]
+                        )
+                    elif self._depth == 1:
+                        self._complete(index + 1, completed)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._token_start = index
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expecting_key = True
+            elif char in "}]":
+                if self._depth == 1:
+                    self._complete(index, completed)
+                self._depth -= 1
+                if self._depth == 1:
+                    self._complete(index + 1, completed)
+            elif self._depth == 1:
+                if char == ":":
+                    self._expecting_key = False
+                    self._value_start = index + 1
+                elif char == ",":
+                    self._complete(index, completed)
+                    self._expecting_key = True
+
+        return completed
+
+    def _complete(self, end: int, completed: list[tuple[str, Any]]) -> None:
+        """Complete the current field if its value ends at end."""
+        if self._key is None or self._value_start is None:
+            return
+        value_text = self._buffer[self._value_start : end].strip()
+        self._value_start = None
+        if not value_text:
+            return
+        value = json.loads(value_text)
+        if self._key not in self._fields or self._fields[self._key] != value:
+            completed.append((self._key, value))
+        self._fields[self._key] = value
+        self._key = None
@@ -0,0 +1,168 @@
+"""Pool of Mistral API keys with load balancing and health tracking."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import math
+import time
+from typing import Any
+
+import mistralai
+
+from .const import (
+    KEY_AUTH_FAILURE_COOLDOWN,
+    KEY_RATE_LIMIT_COOLDOWN,
+    LOGGER,
+    RATE_LIMIT_REMAINING_HEADERS,
+)
+
+# Status codes after which a request is retried with another key
+KEY_FAILOVER_STATUS_CODES = (401, 429)
+
+
+@dataclass(slots=True)
+class PooledKey:
+    """An API key of the pool with its client and health."""
+
+    name: str
+    client: mistralai.Mistral
+    outstanding: int = 0
+    unhealthy_until: float = 0.0
+    rate_limit_remaining: int | None = None
+    failures: int = 0
+
+    @property
+    def healthy(self) -> bool:
+        """Return if the key can take requests."""
+        return time.monotonic() >= self.unhealthy_until
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the key for diagnostics."""
+        return {
+            "name": self.name,
+            "outstanding": self.outstanding,
+            "healthy": self.healthy,
+            "rate_limit_remaining": self.rate_limit_remaining,
+            "failures": self.failures,
+        }
+
+
+class ApiKeyPool:
+    """Spread requests over several API keys.
+
+    Requests go to the healthy key with the fewest outstanding requests,
+    preferring the one with the most remaining rate budget. Keys answering
+    with 401 or 429 are left out until their cooldown expires.
+    """
+
+    def __init__(self, clients: list[mistralai.Mistral]) -> None:
+        """Initialize the pool."""
+        self.keys = [
+            PooledKey(name=f"key {index + 1}", client=client)
+            for index, client in enumerate(clients)
+        ]
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return len(self.keys)
+
+    @property
+    def primary(self) -> PooledKey:
+        """Return the key configured first."""
+        return self.keys[0]
+
+    def has_healthy_key(self) -> bool:
+        """Return if any key can take requests."""
+        return any(key.healthy for key in self.keys)
+
+    def _select(self) -> PooledKey:
+        """Return the key for the next request."""
+        if not (healthy := [key for key in self.keys if key.healthy]):
+            # All keys are cooling down, use the one that recovers first
+            return min(self.keys, key=lambda key: key.unhealthy_until)
+        return min(
+            healthy,
+            key=lambda key: (
+                key.outstanding,
+                -(
+                    math.inf
+                    if key.rate_limit_remaining is None
+                    else key.rate_limit_remaining
+                ),
+            ),
+        )
+
+    @asynccontextmanager
+    async def async_acquire(self) -> AsyncIterator[PooledKey]:
+        """Acquire a key for the duration of a request."""
+        key = self._select()
+        key.outstanding += 1
+        try:
+            yield key
+        except mistralai.models.SDKError as err:
+            self.report_error(key, err)
+            raise
+        finally:
+            key.outstanding -= 1
+
+    def report_response(self, key: PooledKey, headers: Mapping[str, str]) -> None:
+        """Update the rate budget of a key from response headers."""
+        for header in RATE_LIMIT_REMAINING_HEADERS:
+            if (value := headers.get(header)) is not None:
+                try:
+                    key.rate_limit_remaining = int(value)
+                except ValueError:
+                    continue
+                return
+
+    async def async_stream[_T](
+        self, open_stream: Callable[[PooledKey], AsyncIterator[_T]]
+    ) -> AsyncIterator[_T]:
+        """Stream with a key of the pool, moving to another key when one fails.
+
+        A request is retried on another key after a 401 or 429, at most once
+        per key and only before anything was streamed. The key is held until
+        the stream is consumed.
+        """
+        started = False
+        for attempt in range(len(self.keys)):
+            try:
+                async with self.async_acquire() as key:
+                    async for item in open_stream(key):
+                        started = True
+                        yield item
+                return
+            except mistralai.models.SDKError as err:
+                if (
+                    started
+                    or err.status_code not in KEY_FAILOVER_STATUS_CODES
+                    or attempt == len(self.keys) - 1
+                    or not self.has_healthy_key()
+                ):
+                    raise
+                LOGGER.debug("Retrying request with another API key")
+
+    def report_error(self, key: PooledKey, err: mistralai.models.SDKError) -> None:
+        """Leave a key out of the pool after an authentication or rate limit error."""
+        if err.status_code == 401:
+            cooldown: float = KEY_AUTH_FAILURE_COOLDOWN
+        elif err.status_code == 429:
+            cooldown = KEY_RATE_LIMIT_COOLDOWN
+            if err.raw_response is not None:
+                try:
+                    cooldown = float(err.raw_response.headers["retry-after"])
+                except (KeyError, ValueError):
+                    pass
+            key.rate_limit_remaining = 0
+        else:
+            return
+        key.failures += 1
+        key.unhealthy_until = time.monotonic() + cooldown
+        LOGGER.warning(
+            "Mistral API %s returned status %s, leaving it out for %s seconds",
+            key.name,
+            err.status_code,
+            cooldown,
+        )
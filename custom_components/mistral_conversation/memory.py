@@ -0,0 +1,191 @@
+"""Long-term conversation memory backed by a local vector index."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+import json
+import os
+from pathlib import Path
+import shutil
+
+import numpy as np
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import STORAGE_DIR
+
+from .const import DOMAIN, LOGGER, MEMORY_MIN_SIMILARITY
+
+type Embedder = Callable[[list[str]], Awaitable[np.ndarray]]
+
+VECTORS_FILE = "vectors.f32"
+TEXTS_FILE = "texts.jsonl"
+META_FILE = "meta.json"
+
+
+def get_memory_path(hass: HomeAssistant, subentry_id: str = "") -> Path:
+    """Return the memory directory of a subentry, or the one of all memories."""
+    return Path(hass.config.path(STORAGE_DIR, f"{DOMAIN}_memory", subentry_id))
+
+
+async def async_remove_stale_memories(
+    hass: HomeAssistant, subentry_ids: Iterable[str]
+) -> None:
+    """Delete the memories of all subentries except the given ones."""
+    keep = set(subentry_ids)
+
+    def _remove() -> None:
+        path = get_memory_path(hass)
+        if not path.is_dir():
+            return
+        for memory_path in path.iterdir():
+            if memory_path.name not in keep:
+                LOGGER.debug("Removing memory of deleted agent %s", memory_path.name)
+                shutil.rmtree(memory_path, ignore_errors=True)
+
+    await hass.async_add_executor_job(_remove)
+
+
+class MemoryIndex:
+    """On-disk vector index of memories.
+
+    Normalized float32 embeddings are appended as raw rows to a binary file,
+    and the matching texts as JSON lines to a file next to it. The width of
+    the rows is kept in a metadata file. In memory, the rows live in an array
+    that doubles its capacity when full.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the index."""
+        self.path = path
+        self.texts: list[str] = []
+        self._vectors: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        """Return the number of memories."""
+        return len(self.texts)
+
+    def load(self) -> None:
+        """Load the index from disk.
+
+        A crash while appending can leave more rows in one file than in the
+        other, so both are cut to the memories they have in common.
+        """
+        vectors_path = self.path / VECTORS_FILE
+        texts_path = self.path / TEXTS_FILE
+        meta_path = self.path / META_FILE
+        if not all(path.exists() for path in (vectors_path, texts_path, meta_path)):
+            return
+
+        try:
+            dim = int(json.loads(meta_path.read_text(encoding="utf-8"))["dim"])
+        except (ValueError, KeyError, TypeError):
+            LOGGER.warning("Ignoring corrupt memory index in %s", self.path)
+            return
+        texts = []
+        with texts_path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    texts.append(json.loads(line))
+                except ValueError:
+                    break
+        vectors = np.fromfile(vectors_path, dtype=np.float32)
+        count = min(vectors.size // dim, len(texts)) if dim > 0 else 0
+        if not count:
+            return
+
+        if count * dim != vectors.size or count != len(texts):
+            LOGGER.warning(
+                "Truncating memory index in %s to %s complete memories",
+                self.path,
+                count,
+            )
+            os.truncate(vectors_path, count * dim * vectors.itemsize)
+            with texts_path.open("w", encoding="utf-8") as file:
+                file.writelines(json.dumps(text) + "\n" for text in texts[:count])
+
+        self.texts = texts[:count]
+        self._vectors = vectors[: count * dim].reshape(count, dim)
+
+    def append(self, texts: list[str], vectors: np.ndarray) -> None:
+        """Normalize and append memories, in memory and on disk."""
+        vectors = vectors.astype(np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True).clip(min=1e-12)
+
+        count = len(self.texts)
+        if self._vectors is None:
+            self._vectors = np.empty(
+                (max(len(texts), 16), vectors.shape[1]), np.float32
+            )
+        elif count + len(texts) > len(self._vectors):
+            grown = np.empty(
+                (max(2 * len(self._vectors), count + len(texts)), vectors.shape[1]),
+                np.float32,
+            )
+            grown[:count] = self._vectors[:count]
+            self._vectors = grown
+        self._vectors[count : count + len(texts)] = vectors
+        self.texts.extend(texts)
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        # The first memories replace whatever unusable index was left on disk
+        mode = "a" if count else "w"
+        if not count:
+            (self.path / META_FILE).write_text(
+                json.dumps({"dim": vectors.shape[1]}), encoding="utf-8"
+            )
+        with (self.path / VECTORS_FILE).open(f"{mode}b") as file:
+            file.write(vectors.tobytes())
+        with (self.path / TEXTS_FILE).open(mode, encoding="utf-8") as file:
+            file.writelines(json.dumps(text) + "\n" for text in texts)
+
+    def search(self, vector: np.ndarray, top_k: int) -> list[tuple[str, float]]:
+        """Return the top_k most similar memories with their cosine similarity."""
+        if self._vectors is None or not self.texts or top_k < 1:
+            return []
+        query = vector.astype(np.float32)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+
+        scores = self._vectors[: len(self.texts)] @ query
+        top_k = min(top_k, scores.size)
+        best = np.argpartition(scores, -top_k)[-top_k:]
+        best = best[np.argsort(scores[best])[::-1]]
+        return [(self.texts[index], float(scores[index])) for index in best]
+
+
+class ConversationMemory:
+    """Recall and remember conversation turns of an agent."""
+
+    def __init__(self, hass: HomeAssistant, path: Path, embed: Embedder) -> None:
+        """Initialize the memory."""
+        self.hass = hass
+        self.index = MemoryIndex(path)
+        self._embed = embed
+        self._last_query: str | None = None
+        self._last_recalled: list[str] = []
+        self._append_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load the index from disk."""
+        await self.hass.async_add_executor_job(self.index.load)
+
+    async def async_recall(self, query: str, top_k: int) -> list[str]:
+        """Return the memories most relevant to the query."""
+        if not query or not len(self.index):
+            return []
+        # Tool call rounds of a turn recall memories for the same query
+        if query != self._last_query:
+            vector = (await self._embed([query]))[0]
+            self._last_recalled = [
+                text
+                for text, score in self.index.search(vector, top_k)
+                if score >= MEMORY_MIN_SIMILARITY
+            ]
+            self._last_query = query
+        return self._last_recalled
+
+    async def async_remember(self, texts: list[str]) -> None:
+        """Embed and store memories."""
+        vectors = await self._embed(texts)
+        async with self._append_lock:
+            await self.hass.async_add_executor_job(self.index.append, texts, vectors)
@@ -0,0 +1,154 @@
+"""Prefix-stable prompt assembly for the Mistral integration.
+
+Providers cache the longest request prefix they have seen before, so the
+request is laid out from the most static content to the most dynamic one:
+instructions and tool definitions first, then the conversation history, and
+the per-turn context (such as the current time) leading the latest user
+message.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+from typing import Any
+
+from .const import DYNAMIC_PROMPT_PATTERNS
+
+_DYNAMIC_PROMPT_RE = re.compile("|".join(DYNAMIC_PROMPT_PATTERNS))
+
+
+def split_system_prompt(content: str) -> tuple[str, str]:
+    """Split a system prompt into its static and dynamic lines."""
+    static_lines: list[str] = []
+    dynamic_lines: list[str] = []
+    for line in content.splitlines():
+        if _DYNAMIC_PROMPT_RE.match(line.strip()):
+            dynamic_lines.append(line.strip())
+        else:
+            static_lines.append(line)
+    return "\n".join(static_lines).strip(), "\n".join(dynamic_lines)
+
+
+def trim_history(
+    messages: list[dict[str, Any]], recent_messages: int
+) -> list[dict[str, Any]]:
+    """Keep the system prompt and about recent_messages of the latest history.
+
+    The kept history starts at a user message so that tool calls are never
+    separated from their results.
+    """
+    system = messages[:1] if messages and messages[0]["role"] == "system" else []
+    history = messages[len(system) :]
+    user_indexes = [
+        index for index, message in enumerate(history) if message["role"] == "user"
+    ]
+    if not user_indexes:
+        return messages
+    start = next(
+        (
+            index
+            for index in reversed(user_indexes)
+            if len(history) - index >= recent_messages
+        ),
+        user_indexes[0],
+    )
+    return [*system, *history[start:]]
+
+
+def layout_messages(
+    messages: list[dict[str, Any]], context: list[str] | None = None
+) -> list[dict[str, Any]]:
+    """Order Mistral messages from the most static to the most dynamic content.
+
+    The dynamic lines of the leading system prompt and the per-turn context
+    are moved to a block leading the latest user message, so the instructions
+    and the earlier history stay byte-identical between turns. Mistral does
+    not accept a system message after an assistant or tool message, so the
+    block can not be a message of its own.
+    """
+    if messages and messages[0]["role"] == "system":
+        static, dynamic = split_system_prompt(messages[0]["content"] or "")
+        head = [{"role": "system", "content": static}]
+        history = messages[1:]
+    else:
+        dynamic = ""
+        head = []
+        history = messages
+
+    if context:
+        dynamic = "\n\n".join(part for part in (dynamic, *context) if part)
+    if not dynamic:
+        return messages
+
+    last_user = next(
+        (
+            index
+            for index in range(len(history) - 1, -1, -1)
+            if history[index]["role"] == "user"
+        ),
+        None,
+    )
+    if last_user is None:
+        # Without a user message to lead, the block stays in the system prompt
+        if not head:
+            return messages
+        head[0]["content"] = "\n\n".join(
+            part for part in (head[0]["content"], dynamic) if part
+        )
+        return [*head, *history]
+
+    user_message = history[last_user]
+    return [
+        *head,
+        *history[:last_user],
+        {
+            **user_message,
+            "content": "\n\n".join(
+                part for part in (dynamic, user_message["content"]) if part
+            ),
+        },
+        *history[last_user + 1 :],
+    ]
+
+
+def _fingerprint(value: Any) -> str:
+    """Return a stable fingerprint of a JSON serializable value."""
+    return hashlib.sha256(
+        json.dumps(value, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class PrefixTracker:
+    """Measure how much of a request prefix is shared with the previous one."""
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._static: str | None = None
+        self._messages: list[str] = []
+
+    def record(
+        self, tools: list[dict[str, Any]] | None, messages: list[dict[str, Any]]
+    ) -> tuple[bool, int]:
+        """Record a request.
+
+        Returns whether the static part (tools and instructions) is unchanged
+        and the number of leading messages shared with the previous request.
+        """
+        message_fingerprints = [_fingerprint(message) for message in messages]
+        static = _fingerprint([tools, message_fingerprints[:1]])
+
+        stable = static == self._static
+        shared = 0
+        if stable:
+            for previous, current in zip(
+                self._messages, message_fingerprints, strict=False
+            ):
+                if previous != current:
+                    break
+                shared += 1
+
+        self._static = static
+        self._messages = message_fingerprints
+        return stable, shared
@@ -0,0 +1,98 @@
+"""Services for the Mistral integration."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_MODEL
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import DOMAIN, RECOMMENDED_CHAT_MODEL, SERVICE_GENERATE_BATCH
+
+ATTR_CONFIG_ENTRY = "config_entry"
+ATTR_PROMPTS = "prompts"
+ATTR_INSTRUCTIONS = "instructions"
+ATTR_MAX_TOKENS = "max_tokens"
+ATTR_FILENAME = "filename"
+
+PROMPT_SCHEMA = vol.Any(
+    cv.string,
+    vol.Schema({vol.Required("id"): cv.string, vol.Required("prompt"): cv.string}),
+)
+
+GENERATE_BATCH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY): cv.string,
+        vol.Required(ATTR_PROMPTS): vol.All(
+            cv.ensure_list, vol.Length(min=1), [PROMPT_SCHEMA]
+        ),
+        vol.Optional(CONF_MODEL, default=RECOMMENDED_CHAT_MODEL): cv.string,
+        vol.Optional(ATTR_INSTRUCTIONS): cv.string,
+        vol.Optional(ATTR_MAX_TOKENS): cv.positive_int,
+        vol.Optional(ATTR_FILENAME): cv.string,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def generate_batch(call: ServiceCall) -> ServiceResponse:
+        """Queue prompts as a batch job."""
+        entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY])
+        if entry is None or entry.domain != DOMAIN:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="invalid_config_entry",
+                translation_placeholders={
+                    "config_entry": call.data[ATTR_CONFIG_ENTRY]
+                },
+            )
+        if entry.state is not ConfigEntryState.LOADED:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="entry_not_loaded",
+            )
+
+        output_file = None
+        if filename := call.data.get(ATTR_FILENAME):
+            output_file = Path(hass.config.path(filename))
+            if not hass.config.is_allowed_path(str(output_file)):
+                raise ServiceValidationError(
+                    translation_domain=DOMAIN,
+                    translation_key="no_access_to_path",
+                    translation_placeholders={"filename": filename},
+                )
+
+        prompts = [
+            prompt
+            if isinstance(prompt, dict)
+            else {"id": str(index), "prompt": prompt}
+            for index, prompt in enumerate(call.data[ATTR_PROMPTS])
+        ]
+        job_id = await entry.runtime_data.batch_jobs.async_create_job(
+            prompts,
+            call.data[CONF_MODEL],
+            call.data.get(ATTR_INSTRUCTIONS),
+            call.data.get(ATTR_MAX_TOKENS),
+            output_file,
+        )
+        return {"job_id": job_id}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GENERATE_BATCH,
+        generate_batch,
+        schema=GENERATE_BATCH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,25 @@
+"""Labelled counters for the Mistral integration."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+
+class MistralStats:
+    """Labelled counters used to tune the integration."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self._counters: Counter[tuple[str, ...]] = Counter()
+
+    def increment(self, name: str, *labels: str, value: float = 1) -> None:
+        """Increment the counter identified by name and labels."""
+        self._counters[(name, *labels)] += value
+
+    def get(self, name: str, *labels: str) -> float:
+        """Return the value of a counter."""
+        return self._counters[(name, *labels)]
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the counters keyed by their joined name and labels."""
+        return {"/".join(key): value for key, value in sorted(self._counters.items())}
@@ -0,0 +1,90 @@
+"""Stall watchdog for streaming Mistral responses."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+
+from homeassistant.exceptions import HomeAssistantError
+
+PHASE_CONNECT = "connect"
+PHASE_FIRST_TOKEN = "first_token"
+PHASE_CHUNK = "chunk"
+PHASE_TOTAL = "total"
+
+
+class StreamStalledError(HomeAssistantError):
+    """Error raised when a streaming response stalls."""
+
+    def __init__(self, phase: str) -> None:
+        """Initialize the error."""
+        super().__init__(f"Mistral response stalled during {phase} phase")
+        self.phase = phase
+        self.partial_content = ""
+
+
+@dataclass(frozen=True, slots=True)
+class StreamTimeouts:
+    """Timeouts in seconds for each phase of a streaming response.
+
+    A value of 0 disables the timeout for that phase.
+    """
+
+    connect: float
+    first_token: float
+    chunk: float
+    total: float
+
+
+async def async_watch_stream[_T](
+    open_stream: Callable[
+        [], Awaitable[AbstractAsyncContextManager[AsyncIterator[_T]]]
+    ],
+    timeouts: StreamTimeouts,
+    is_token: Callable[[_T], bool] = lambda chunk: True,
+) -> AsyncIterator[_T]:
+    """Yield stream chunks, raising StreamStalledError when a phase times out.
+
+    The first token phase lasts until a chunk matching is_token arrives, every
+    later chunk has to arrive within the chunk timeout. All phases are bounded
+    by the total timeout.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeouts.total if timeouts.total else None
+
+    def _budget(phase: str, phase_timeout: float) -> tuple[str, float | None]:
+        """Return the binding phase and the time left for it."""
+        if deadline is None:
+            return phase, phase_timeout or None
+        remaining = max(deadline - loop.time(), 0)
+        if phase_timeout and phase_timeout < remaining:
+            return phase, phase_timeout
+        return PHASE_TOTAL, remaining
+
+    phase, timeout = _budget(PHASE_CONNECT, timeouts.connect)
+    try:
+        async with asyncio.timeout(timeout):
+            stream = await open_stream()
+    except TimeoutError as err:
+        raise StreamStalledError(phase) from err
+
+    async with stream as iterator:
+        waiting_for_token = True
+        while True:
+            phase, timeout = (
+                _budget(PHASE_FIRST_TOKEN, timeouts.first_token)
+                if waiting_for_token
+                else _budget(PHASE_CHUNK, timeouts.chunk)
+            )
+            try:
+                async with asyncio.timeout(timeout):
+                    chunk = await anext(iterator)
+            except StopAsyncIteration:
+                return
+            except TimeoutError as err:
+                raise StreamStalledError(phase) from err
+            if waiting_for_token and is_token(chunk):
+                waiting_for_token = False
+            yield chunk
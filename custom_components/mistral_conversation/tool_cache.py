@@ -0,0 +1,89 @@
+"""Short-lived cache for results of read-only tools."""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any
+
+from homeassistant.components import conversation
+from homeassistant.components.homeassistant.exposed_entities import (
+    async_should_expose,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+
+
+class ToolResultCache:
+    """Cache tool results keyed on tool name and canonicalized arguments.
+
+    The cache is shared by all agents of a config entry and cleared whenever
+    an entity exposed to conversation agents changes state.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._entries: dict[tuple[str, str], tuple[float, Any]] = {}
+
+    @staticmethod
+    def _key(tool_name: str, tool_args: dict[str, Any]) -> tuple[str, str]:
+        """Return the cache key for a tool call."""
+        return tool_name, json.dumps(
+            tool_args, sort_keys=True, separators=(",", ":"), default=str
+        )
+
+    @callback
+    def async_get(
+        self, tool_name: str, tool_args: dict[str, Any], ttl: float
+    ) -> tuple[bool, Any]:
+        """Return whether a fresh result is cached, and the result."""
+        key = self._key(tool_name, tool_args)
+        if (entry := self._entries.get(key)) is None:
+            return False, None
+        stored_at, result = entry
+        if time.monotonic() - stored_at >= ttl:
+            del self._entries[key]
+            return False, None
+        return True, result
+
+    @callback
+    def async_set(
+        self, tool_name: str, tool_args: dict[str, Any], result: Any
+    ) -> None:
+        """Store a tool result."""
+        self._entries[self._key(tool_name, tool_args)] = (time.monotonic(), result)
+
+    @callback
+    def async_invalidate(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    @callback
+    def async_setup(self) -> CALLBACK_TYPE:
+        """Invalidate the cache on relevant state changes.
+
+        Returns a callback to stop listening.
+        """
+
+        @callback
+        def _is_relevant(event_data: EventStateChangedData) -> bool:
+            """Return if the state change can affect a cached result."""
+            return bool(self._entries) and async_should_expose(
+                self.hass, conversation.DOMAIN, event_data["entity_id"]
+            )
+
+        @callback
+        def _state_changed(event: Event[EventStateChangedData]) -> None:
+            """Handle a state change."""
+            self.async_invalidate()
+
+        return self.hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _state_changed, event_filter=_is_relevant
+        )